@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+from typing import Iterable
 from typing import List
+from typing import Optional
+from typing import Set
 
 import typer
-from harborapi.models.models import CVEAllowlist
-from harborapi.models.models import CVEAllowlistItem
 
 from ...output.console import exit_ok
 from ...output.console import info
@@ -12,8 +16,15 @@ from ...output.render import render_result
 from ...state import get_state
 from ...utils import parse_commalist
 
+if TYPE_CHECKING:
+    from harborapi.models.models import CVEAllowlist
+
 state = get_state()
 
+CLEAR_CACHE_TTL = 60.0
+"""Max age in seconds of a cached allowlist whose metadata is re-used
+when clearing the allowlist."""
+
 # Create a command group
 app = typer.Typer(
     name="cve-allowlist",
@@ -22,10 +33,78 @@ app = typer.Typer(
 )
 
 
+@dataclass
+class _PendingAllowlistBatch:
+    """CVE allowlist changes queued by `update --batch`.
+
+    All queued changes are applied with a single fetch + update of the
+    allowlist when the batch is flushed.
+    """
+
+    to_add: Set[str] = field(default_factory=set)
+    to_remove: Set[str] = field(default_factory=set)
+
+    def queue(self, cves: Iterable[str], remove: bool) -> None:
+        """Queue CVE IDs to add or remove. The most recent change to a CVE ID wins."""
+        for cve_id in cves:
+            if remove:
+                self.to_add.discard(cve_id)
+                self.to_remove.add(cve_id)
+            else:
+                self.to_remove.discard(cve_id)
+                self.to_add.add(cve_id)
+
+    def flush(self) -> None:
+        """Apply all queued changes to the CVE allowlist."""
+        if not self.to_add and not self.to_remove:
+            return
+        current = _update_allowlist(sorted(self.to_add), sorted(self.to_remove))
+        # Flushing must never exit, since it runs before other commands
+        if current is None:
+            info("CVE allowlist is empty, nothing to remove.")
+            return
+        info(
+            f"Added {len(self.to_add)} and removed {len(self.to_remove)} CVEs "
+            f"from CVE allowlist. Total: {len(current.items or [])}"
+        )
+
+
+def _update_allowlist(add: List[str], remove: List[str]) -> Optional[CVEAllowlist]:
+    """Fetch the current allowlist, add and remove the given CVE IDs,
+    and update the allowlist. Returns the updated allowlist, or `None`
+    if there is nothing to remove from an empty allowlist."""
+    from harborapi.models.models import CVEAllowlistItem
+
+    current = state.get_cve_allowlist_cached()
+
+    # Check if the current allowlist is defined
+    if current.items is None:
+        if not add:
+            return None
+        current.items = []
+
+    if remove:
+        to_remove = set(remove)
+        current.items = [item for item in current.items if item.cve_id not in to_remove]
+    if add:
+        # Skip CVE IDs that are already in the allowlist or given more than once,
+        # so we only create one CVEAllowlistItem per new CVE ID
+        seen = {item.cve_id for item in current.items if item.cve_id is not None}
+        for cve_id in add:
+            if cve_id and cve_id not in seen:
+                seen.add(cve_id)
+                current.items.append(CVEAllowlistItem(cve_id=cve_id))
+
+    state.run(state.client.update_cve_allowlist(current), "Updating CVE allowlist...")
+    state.allowlist_cache = None
+    return current
+
+
 @app.command("get")
 def get_allowlist(ctx: typer.Context) -> None:
     """Get the current CVE allowlist."""
-    allowlist = state.run(state.client.get_cve_allowlist(), "Fetching system info...")
+    state.flush_pending()
+    allowlist = state.get_cve_allowlist_cached(ttl=0)  # always fetch, but cache it
     render_result(allowlist, ctx)
 
 
@@ -43,36 +122,47 @@ def update_allowlist(
         "--remove",
         help="Remove the given CVE IDs from the allowlist instead of adding them.",
     ),
+    batch: bool = typer.Option(
+        False,
+        "--batch",
+        help=(
+            "Queue the changes and apply them together with other batched changes "
+            "in a single update. Batched changes are applied when the REPL exits, "
+            "or when running any other CVE allowlist command. Only useful in REPL mode."
+        ),
+    ),
 ) -> None:
     """Add/remove CVE IDs to the CVE allowlist."""
-    current = state.run(state.client.get_cve_allowlist())
-
-    # Check if the current allowlist is defined
-    if current.items is None:
-        if remove:
-            exit_ok("CVE allowlist is empty, nothing to remove.")
-        current.items = []
+    if batch:
+        pending = state.pending_allowlist
+        if not isinstance(pending, _PendingAllowlistBatch):
+            if pending is not None:
+                state.flush_pending()
+            pending = _PendingAllowlistBatch()
+            state.pending_allowlist = pending
+        pending.queue(cves, remove)
+        if not state.repl:
+            state.flush_pending()
+        else:
+            info(
+                f"Queued {len(cves)} CVEs for CVE allowlist update. "
+                f"Pending: {len(pending.to_add) + len(pending.to_remove)}"
+            )
+        return
 
+    state.flush_pending()
     if remove:
-        current.items = [item for item in current.items if item.cve_id not in cves]
-    else:
-        # Make a list of all CVE IDs in the current allowlist
-        current_ids = [item.cve_id for item in current.items if item.cve_id is not None]
-        # Create new CVEAllowListItem objects for each CVE ID
-        to_add = [
-            CVEAllowlistItem(cve_id=cve_id)
-            for cve_id in cves
-            if cve_id not in current_ids
-        ]
-        current.items.extend(to_add)
-
-    state.run(state.client.update_cve_allowlist(current), "Updating CVE allowlist...")
-    if remove:
+        current = _update_allowlist(add=[], remove=cves)
+        if current is None:
+            exit_ok("CVE allowlist is empty, nothing to remove.")
         info(
-            f"Removed {len(cves)} CVEs from CVE allowlist. Total: {len(current.items)}"
+            f"Removed {len(cves)} CVEs from CVE allowlist. Total: {len(current.items or [])}"
         )
     else:
-        info(f"Added {len(cves)} CVEs to CVE allowlist. Total: {len(current.items)}")
+        current = _update_allowlist(add=cves, remove=[])
+        info(
+            f"Added {len(cves)} CVEs to CVE allowlist. Total: {len(current.items or [])}"
+        )
 
 
 @app.command("clear")
@@ -85,16 +175,20 @@ def clear_allowlist(
     ),
 ) -> None:
     """Clear the current CVE allowlist of all CVEs, and optionally all metadata as well."""
+    from harborapi.models.models import CVEAllowlist
+
+    # Changes queued before the clear are superseded by it
+    state.pending_allowlist = None
     if full_clear:
         allowlist = CVEAllowlist(items=[])  # pyright: ignore[reportCallIssue] # create a whole new allowlist
     else:
-        # Fetch existing allowlist to preserve metadata
-        allowlist = state.run(
-            state.client.get_cve_allowlist(), "Fetching current allowlist..."
-        )
+        # Fetch existing allowlist to preserve metadata.
+        # Its items are discarded, so an older cached allowlist is fine.
+        allowlist = state.get_cve_allowlist_cached(ttl=CLEAR_CACHE_TTL)
         allowlist.items = []
 
     state.run(state.client.update_cve_allowlist(allowlist), "Clearing CVE allowlist...")
+    state.allowlist_cache = None
     msg = "Cleared CVE allowlist of CVEs."
     if full_clear:
         msg += " Also cleared metadata."
@@ -253,8 +253,11 @@ def create_replication_policy(
     params = model_params_from_ctx(ctx, ReplicationPolicy)
 
     # Get registries from API
-    src_registry = state.run(state.client.get_registry(src_registry_id))
-    dest_registry = state.run(state.client.get_registry(dest_registry_id))
+    src_registry, dest_registry = state.run_many(
+        state.client.get_registry(src_registry_id),
+        state.client.get_registry(dest_registry_id),
+        status="Fetching registries...",
+    )
 
     # Create the filter objects
     filters: List[ReplicationFilter] = []
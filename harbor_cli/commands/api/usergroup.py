@@ -3,7 +3,6 @@ from __future__ import annotations
 from typing import Optional
 
 import typer
-from harborapi.models.models import UserGroup
 
 from ...models import UserGroupType
 from ...output.console import exit_err
@@ -54,6 +53,8 @@ def create_usergroup(
     ),
 ) -> None:
     """Create a user group."""
+    from harborapi.models.models import UserGroup
+
     if group_type == UserGroupType.LDAP and ldap_group_dn is None:
         exit_err("--ldap-group-dn is required for LDAP user groups.")
 
@@ -77,6 +78,8 @@ def update_usergroup(
     # NOTE: make group_name optional if we can update other fields in the future
 ) -> None:
     """Update a user group. Only the name can be updated currently."""
+    from harborapi.models.models import UserGroup
+
     usergroup = UserGroup(group_name=group_name)  # pyright: ignore[reportCallIssue]
     state.run(
         state.client.update_usergroup(group_id, usergroup),
@@ -50,4 +50,11 @@ def repl(
     prompt_kwargs = {}
     if state.config.repl.history:
         prompt_kwargs["history"] = FileHistory(str(state.config.repl.history_file))
-    start_repl(ctx, prompt_kwargs=prompt_kwargs)
+    try:
+        start_repl(ctx, prompt_kwargs=prompt_kwargs)
+    finally:
+        # Apply batched changes and pending config saves before exiting
+        try:
+            state.flush_pending()
+        finally:
+            state.flush_config()
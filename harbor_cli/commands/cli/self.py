@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-import itertools
+import errno
+import functools
 import os
+import stat
+import sys
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
@@ -9,10 +12,16 @@ from typing import Dict
 from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import Union
+from typing import get_args
+from typing import get_origin
 
 import typer
 from pydantic import BaseModel as PydanticBaseModel
 from pydantic import ValidationError
+from rich.text import Text
 
 from ...config import DEFAULT_CONFIG_FILE
 from ...config import EnvVar
@@ -66,6 +75,110 @@ def render_config(config: HarborCLIConfig, as_toml: bool) -> None:
         render_result(config)
 
 
+if sys.version_info >= (3, 10):
+    from types import UnionType
+
+    # `X | None` annotations have a different origin than `Optional[X]`
+    _UNION_TYPES: Tuple[Any, ...] = (Union, UnionType)
+else:
+    _UNION_TYPES: Tuple[Any, ...] = (Union,)
+
+
+def _nested_model(annotation: Any) -> Optional[Type[PydanticBaseModel]]:
+    """Get the model class of a field annotation if it is a model
+    or an optional model, otherwise `None`."""
+    if get_origin(annotation) in _UNION_TYPES:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            annotation = args[0]
+    if isinstance(annotation, type) and issubclass(annotation, PydanticBaseModel):
+        return annotation
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _model_subfields(
+    cls: Type[PydanticBaseModel],
+) -> Tuple[Tuple[str, Optional[Type[PydanticBaseModel]]], ...]:
+    """Get the names of the fields of a config model along with the
+    model class of each field that is a nested model (table).
+
+    Fields excluded from serialization are not part of the config file
+    and are omitted.
+
+    Parameters
+    ----------
+    cls : Type[PydanticBaseModel]
+        The config model class.
+
+    Returns
+    -------
+    Tuple[Tuple[str, Optional[Type[PydanticBaseModel]]], ...]
+        Pairs of field names and nested model classes (`None` for non-model fields).
+    """
+    return tuple(
+        (name, _nested_model(field.annotation))
+        for name, field in cls.model_fields.items()
+        if not field.exclude
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _config_dotted_keys(cls: Type[PydanticBaseModel]) -> Tuple[str, ...]:
+    """Get the dot notation keys of all fields of a config model.
+
+    Keys are derived from the model's field definitions, so no
+    config instance needs to be serialized to find them.
+
+    Parameters
+    ----------
+    cls : Type[PydanticBaseModel]
+        The config model class.
+
+    Returns
+    -------
+    Tuple[str, ...]
+        Dot notation keys of all fields, e.g. `harbor.retry.enabled`.
+    """
+    keys: List[str] = []
+    for name, nested in _model_subfields(cls):
+        if nested is not None:
+            keys.extend(f"{name}.{key}" for key in _config_dotted_keys(nested))
+        else:
+            keys.append(name)
+    return tuple(keys)
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_config_path(key: str) -> Tuple[Tuple[str, ...], str]:
+    """Split a dot notation config key into the attributes leading up to
+    the parent of the key and the final attribute name.
+
+    E.g. `harbor.retry.enabled` -> `(("harbor", "retry"), "enabled")`
+    """
+    *path, final = key.split(".")
+    return tuple(path), final
+
+
+@functools.lru_cache(maxsize=None)
+def _config_dotted_tables(cls: Type[PydanticBaseModel]) -> Tuple[str, ...]:
+    """Get the dot notation keys of all tables (nested models) of a config model,
+    e.g. `harbor` and `harbor.retry`."""
+    tables: List[str] = []
+    for name, nested in _model_subfields(cls):
+        if nested is not None:
+            tables.append(name)
+            tables.extend(f"{name}.{table}" for table in _config_dotted_tables(nested))
+    return tuple(tables)
+
+
+_LEAF_KEYS = frozenset(_config_dotted_keys(HarborCLIConfig))
+"""All config keys that can be set with dot notation."""
+
+_VALID_KEYS = _LEAF_KEYS | frozenset(_config_dotted_tables(HarborCLIConfig))
+"""All config keys that can be accessed with dot notation, including tables."""
+
+
 @config_cmd.callback()
 def callback(ctx: typer.Context) -> None:
     state = get_state()
@@ -94,18 +207,11 @@ def get_cli_config(
     """Show the current CLI configuration."""
     state = get_state()
     if key:
-        try:
-            if (attrs := key.split(".")) and len(attrs) > 1:
-                obj = getattr(state.config, attrs[0])
-                for attr in attrs[1:-1]:
-                    obj = getattr(obj, attr)
-                value = getattr(obj, attrs[-1])
-            else:
-                value = getattr(state.config, key)
-        except AttributeError:
+        if key not in _VALID_KEYS:
             exit_err(f"Invalid config key: {render_cli_value(key)}")
-        else:
-            render_result(value)
+        parents, attr = _resolve_config_path(key)
+        obj = functools.reduce(getattr, parents, state.config)
+        render_result(getattr(obj, attr))
     else:
         render_config(state.config, as_toml)
         if state.config.config_file is not None:
@@ -121,26 +227,8 @@ def get_cli_config(
 )
 def get_cli_config_keys(ctx: typer.Context) -> None:
     state = get_state()
-
-    def get_fields(field: dict[str, Any], current: str) -> list[str]:
-        fields: List[str] = []
-        for sub_key, sub_value in field.items():
-            if isinstance(sub_value, dict):
-                fields.extend(
-                    get_fields(
-                        sub_value,  # pyright: ignore[reportUnknownArgumentType]
-                        f"{current}.{sub_key}",
-                    )
-                )
-            else:
-                fields.append(f"{current}.{sub_key}")
-        return fields
-
-    d = state.config.model_dump()
-    keys = itertools.chain.from_iterable(
-        get_fields(value, key) for key, value in d.items()
-    )
-    render_result(AnySequence(values=list(keys), title="Config Keys"))
+    keys = _config_dotted_keys(type(state.config))
+    render_result(AnySequence(values=keys, title="Config Keys"))
 
 
 @config_cmd.command(
@@ -176,37 +264,25 @@ def set_cli_config(
 
     state = get_state()
 
+    # Only leaf keys can be set. Overwriting config tables is not allowed.
+    if key not in _LEAF_KEYS:
+        exit_err(f"Invalid config key: {key!r}")
+    parents, attr = _resolve_config_path(key)
+    obj = functools.reduce(getattr, parents, state.config)
+
     try:
-        if (attrs := key.split(".")) and len(attrs) > 1:
-            obj = getattr(state.config, attrs[0])
-            for attr in attrs[1:-1]:
-                obj = getattr(obj, attr)
-            assert isinstance(obj, PydanticBaseModel)
-            to_set = attrs[-1]
-            if to_set not in obj.model_fields:
-                raise AttributeError
-            setattr(obj, attrs[-1], value)
-        else:
-            # Top-level primitive keys are supported, but we shouldn't have any!
-            # It's just here in case we do add it in the future.
-            # Overwriting top-level model keys is not allowed.
-            obj = getattr(state.config, key)
-            if isinstance(obj, PydanticBaseModel):
-                raise AttributeError("Overwriting config tables is not allowed.")
-            setattr(state.config, key, value)
+        setattr(obj, attr, value)
     except ValidationError as e:
         # There should be at least one error, but we play it safe
         errors = e.errors()
         error = errors[0]["msg"] if errors else str(e)
         exit_err(f"Invalid value for key {key!r}: {error}")
-    except (
-        ValueError,  # setattr failed for unknown model field (Pydantic)
-        AttributeError,  # getattr failed
-    ):
-        exit_err(f"Invalid config key: {key!r}")
 
     if not session:
-        state.config.save(path=path)
+        # Only the changed key is patched into the config's own file.
+        # Saving to a different path writes the whole config there.
+        own_file = path is None or path == state.config.config_file
+        state.mark_config_dirty(path=path, key=key if own_file else None)
 
     if show_config:
         render_config(state.config, as_toml)
@@ -236,10 +312,32 @@ def write_session_config(
         exit_err(
             f"No path specified and no path found in current configuration. Use {render_cli_option('--path')} to specify a path."
         )
+    state.flush_config()  # don't let a pending save overwrite the file later
     state.config.save(path=save_path)
     success(f"Saved configuration to [green]{save_path}[/]")
 
 
+_NOT_EXISTS_ERRNOS = frozenset({errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP})
+"""Errors for which `Path.exists()` returns `False` instead of raising."""
+
+EMPTY_FILE_MAX_SIZE = 64
+"""Max size of a whitespace-only file that is considered empty."""
+
+
+def _is_empty_file(path: Path, size: int) -> bool:
+    """Check if a file is empty or only contains whitespace.
+
+    Only small files are read to check for whitespace. Files larger than
+    `EMPTY_FILE_MAX_SIZE` bytes are never considered empty.
+    """
+    if size == 0:
+        return True
+    if size > EMPTY_FILE_MAX_SIZE:
+        return False
+    with open(path, "rb") as f:
+        return not f.read(EMPTY_FILE_MAX_SIZE).strip()
+
+
 @config_cmd.command(
     "path",
     help="Show the path to the current configuration file, or default path if no config is loaded.",
@@ -247,16 +345,21 @@ def write_session_config(
 def show_config_path(ctx: typer.Context) -> None:
     state = get_state()
     path = state.config.config_file or DEFAULT_CONFIG_FILE
-    if not path.exists():
+    try:
+        st = path.stat()
+    except OSError as e:
+        if e.errno not in _NOT_EXISTS_ERRNOS:
+            raise
         info("File does not exist.")
-    elif path.is_dir():
-        # this branch should be unreachable since HarborCLIConfig.from_file()
-        # should fail if the path is a directory
-        error(
-            "Path is a directory. Delete the directory so a config file can be created."
-        )
-    elif not path.read_text().strip():
-        info("File exists, but is empty.")
+    else:
+        if stat.S_ISDIR(st.st_mode):
+            # this branch should be unreachable since HarborCLIConfig.from_file()
+            # should fail if the path is a directory
+            error(
+                "Path is a directory. Delete the directory so a config file can be created."
+            )
+        elif _is_empty_file(path, st.st_size):
+            info("File exists, but is empty.")
     render_result(path, ctx)
 
 
@@ -268,11 +371,16 @@ class EnvVars(BaseModel):
 
     def as_table(self, **kwargs: Any) -> Iterable[Table]:  # type: ignore
         table = get_table("Environment Variables", columns=["Variable", "Value"])
+        add_row = table.add_row
         for envvar, value in self.envvars.items():
-            table.add_row(envvar, value)
+            # Text is rendered as-is, without parsing the value for markup
+            add_row(Text(envvar), Text(value))
         yield table
 
 
+_SORTED_ENV_VARS: Tuple[EnvVar, ...] = tuple(sorted(EnvVar))
+
+
 @config_cmd.command()
 def env(
     ctx: typer.Context,
@@ -281,12 +389,11 @@ def env(
     ),
 ) -> None:
     """Show active Harbor CLI environment variables."""
-    active: Dict[str, str] = {}
-    for env_var in sorted(EnvVar):
-        val = os.environ.get(env_var)
-        if not all and val is None:
-            continue
-        active[str(env_var)] = val or ""
+    environ = os.environ
+    values = {str(env_var): environ.get(env_var) for env_var in _SORTED_ENV_VARS}
+    active = {
+        env_var: val or "" for env_var, val in values.items() if all or val is not None
+    }
 
     if not active:
         exit_ok("No environment variables set.")
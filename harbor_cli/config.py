@@ -1,18 +1,25 @@
 from __future__ import annotations
 
+import copy
+import functools
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import List
 from typing import Optional
 from typing import Sequence
+from typing import Set
 from typing import Tuple
+from typing import Type
 from typing import TypedDict
 from typing import cast
 
-import tomli
-import tomli_w
 from harborapi.models.base import BaseModel as HarborBaseModel
 from pydantic import AliasChoices
 from pydantic import ConfigDict
@@ -44,6 +51,12 @@ from .utils.keyring import get_password
 from .utils.keyring import keyring_supported
 from .utils.keyring import set_password
 
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    # tomllib was added to the standard library in 3.11
+    import tomli as tomllib
+
 if TYPE_CHECKING:
     from typing_extensions import Self
 
@@ -56,11 +69,13 @@ DEFAULT_HISTORY_FILE = DATA_DIR / "history"
 ENV_VAR_PREFIX = "HARBOR_CLI_"
 
 
+@functools.lru_cache(maxsize=256)
 def config_env_var(key: str) -> str:
     """Return the environment variable name for a config key."""
     return ENV_VAR_PREFIX + key.upper().replace(".", "_")
 
 
+@functools.lru_cache(maxsize=256)
 def env_var(option: str) -> str:
     """Return the environment variable name for a CLI option."""
     return ENV_VAR_PREFIX + option.upper().replace("-", "_")
@@ -95,9 +110,17 @@ class EnvVar(StrEnum):
         return self.value
 
 
+_TOML_CACHE: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
+"""Parsed TOML files keyed by path, along with the modification time (ns)
+and size of the file when it was parsed."""
+
+
 def load_toml_file(config_file: Path) -> dict[str, Any]:
     """Load a TOML file and return the contents as a dict.
 
+    The parsed contents are cached until the modification time or
+    size of the file changes.
+
     Parameters
     ----------
     config_file : Path,
@@ -108,8 +131,74 @@ def load_toml_file(config_file: Path) -> dict[str, Any]:
     Dict[str, Any]
         A TOML file as a dictionary
     """
-    conf = tomli.loads(config_file.read_text())
-    return conf
+    st = config_file.stat()
+    cached = _TOML_CACHE.get(config_file)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        conf = cached[2]
+    else:
+        with open(config_file, "rb") as f:
+            conf = tomllib.load(f)
+        _TOML_CACHE[config_file] = (st.st_mtime_ns, st.st_size, conf)
+    # Callers are free to modify the returned dict
+    return copy.deepcopy(conf)
+
+
+def write_toml_file(config_file: Path, contents: str, overwrite: bool = True) -> None:
+    """Write a TOML string to a file and invalidate the cached contents
+    of the file, so that it is re-parsed on the next load even if the
+    modification time has not changed.
+
+    Raises `FileExistsError` if the file exists and `overwrite` is `False`.
+    """
+    _TOML_CACHE.pop(config_file, None)
+    with open(config_file, "w" if overwrite else "x", encoding="utf-8") as f:
+        f.write(contents)
+
+
+@functools.lru_cache(maxsize=None)
+def _field_keys(cls: Type[HarborBaseModel], name: str) -> Tuple[str, ...]:
+    """Get the keys a field is loaded from, in the order pydantic looks them up.
+
+    The field name is only included if the model accepts it, i.e. if the
+    field has no alias or the model populates fields by name.
+    """
+    field = cls.model_fields[name]
+    keys: List[str] = []
+    alias = field.validation_alias or field.alias
+    if isinstance(alias, str):
+        keys.append(alias)
+    elif isinstance(alias, AliasChoices):
+        keys.extend(choice for choice in alias.choices if isinstance(choice, str))
+    if not keys or cls.model_config.get("populate_by_name"):
+        if name not in keys:
+            keys.append(name)
+    return tuple(keys)
+
+
+@functools.lru_cache(maxsize=None)
+def _model_keys(cls: Type[HarborBaseModel]) -> FrozenSet[str]:
+    """Get all keys a model accepts, i.e. the names and aliases of its fields."""
+    keys: Set[str] = set()
+    for name, field in cls.model_fields.items():
+        keys.add(name)
+        if field.alias:
+            keys.add(field.alias)
+        keys.update(_field_keys(cls, name))
+    return frozenset(keys)
+
+
+def _patch_key(table: Dict[str, Any], cls: Type[HarborBaseModel], name: str) -> str:
+    """Get the key to write a field to in a config table, and remove
+    any other spellings of the field from the table.
+
+    Keeps the spelling that is already in the table (the one pydantic
+    reads if there are several), otherwise uses the preferred alias.
+    """
+    keys = _field_keys(cls, name)
+    key = next((k for k in keys if k in table), keys[0])
+    for stale in {name, *keys} - {key}:
+        table.pop(stale, None)
+    return key
 
 
 # HACK: We use the harborapi.models.BaseModel as our base class
@@ -132,13 +221,15 @@ class BaseModel(HarborBaseModel):
 
         See: Config class below.
         """
-        for key in values:
-            if key not in cls.model_fields:
-                logger.warning(
-                    "%s: Got unknown config key '%s'.",
-                    getattr(cls, "__name__", str(cls)),
-                    key,
-                )
+        if not isinstance(values, dict):
+            return values
+        unknown = values.keys() - _model_keys(cls)
+        for key in sorted(unknown):
+            logger.warning(
+                "%s: Got unknown config key '%s'.",
+                getattr(cls, "__name__", str(cls)),
+                key,
+            )
         return values
 
     model_config = ConfigDict(extra="allow", validate_assignment=True)
@@ -577,12 +668,25 @@ class HarborCLIConfig(BaseModel):
             raise ConfigError(f"Could not load config file {config_file}: {e}") from e
         return cls(**config, config_file=config_file)
 
-    def save(self, path: Path | None = None) -> None:
+    def save(self, path: Path | None = None, keys: Iterable[str] | None = None) -> None:
+        """Save the config to a TOML file.
+
+        Parameters
+        ----------
+        path : Path | None
+            Path to save the config to. Uses `config_file` if `None`.
+        keys : Iterable[str] | None
+            Dot notation keys to save, e.g. `harbor.url`. Only these keys
+            are updated in the existing file. The whole config is saved if `None`.
+        """
         if not path and not self.config_file:
             raise ValueError("Cannot save config: no config file specified")
         p = path or self.config_file
         assert p is not None  # p shouldn't be None here! am i dumb???
-        save_config(self, p)
+        if keys is None:
+            save_config(self, p)
+        else:
+            save_config_keys(self, p, keys)
 
     def toml(
         self,
@@ -609,6 +713,8 @@ class HarborCLIConfig(BaseModel):
         str
             TOML representation of the config as a string.
         """
+        import tomli_w
+
         tomli_kwargs = tomli_kwargs or {}
         dict_basic_types = replace_none(self.model_dump(mode="json", **kwargs))
 
@@ -629,15 +735,13 @@ def create_config(config_path: Path | None, overwrite: bool = False) -> Path:
 
     try:
         config_path.parent.mkdir(parents=True, exist_ok=True)
-        config_path.touch(exist_ok=overwrite)
+        # Create the file and write the sample config to it in one go
+        write_toml_file(config_path, sample_config(), overwrite=overwrite)
     except FileExistsError as e:
         raise OverwriteError(f"Config file {config_path} already exists.") from e
     except Exception as e:
         raise ConfigError(f"Could not create config file {config_path}: {e}") from e
 
-    # Write sample config to the created file
-    config_path.write_text(sample_config())
-
     return config_path
 
 
@@ -654,14 +758,70 @@ def load_config(config_path: Path | None = None) -> HarborCLIConfig:
 def save_config(config: HarborCLIConfig, config_path: Path) -> None:
     """Save the config file."""
     try:
-        config_path.write_text(config.toml(exclude_none=True))
+        write_toml_file(config_path, config.toml(exclude_none=True))
     except Exception as e:
         raise ConfigError(f"Could not save config file {config_path}: {e}") from e
 
 
+def save_config_keys(
+    config: HarborCLIConfig, config_path: Path, keys: Iterable[str]
+) -> None:
+    """Save the values of the given keys to an existing config file.
+
+    Only the given keys are modified in the file, so the rest of the
+    config does not have to be serialized. Saves the whole config
+    if the file does not exist or cannot be parsed.
+
+    Parameters
+    ----------
+    config : HarborCLIConfig
+        The config to save values from.
+    config_path : Path
+        Path to the config file.
+    keys : Iterable[str]
+        Dot notation keys to save, e.g. `harbor.url`.
+    """
+    import tomli_w
+
+    try:
+        data = load_toml_file(config_path)
+    except (OSError, UnicodeDecodeError, tomllib.TOMLDecodeError) as e:
+        logger.debug("Unable to patch config file %s: %s", config_path, e)
+        return save_config(config, config_path)
+
+    for key in keys:
+        *parents, attr = key.split(".")
+        table = data
+        obj: HarborBaseModel = config
+        # Fields can be spelled by their name or their alias(es) in the file,
+        # so we patch the spelling that is actually loaded.
+        for parent in parents:
+            table = table.setdefault(_patch_key(table, type(obj), parent), {})
+            if not isinstance(table, dict):  # malformed file
+                return save_config(config, config_path)
+            obj = getattr(obj, parent)
+        value = replace_none(
+            obj.model_dump(mode="json", include={attr}, exclude_none=True)
+        )
+        file_key = _patch_key(table, type(obj), attr)
+        if attr in value:
+            table[file_key] = value[attr]
+        else:  # None values are excluded from the file
+            table.pop(file_key, None)
+
+    try:
+        write_toml_file(config_path, tomli_w.dumps(data))
+    except Exception as e:
+        raise ConfigError(f"Could not save config file {config_path}: {e}") from e
+
+
+@functools.lru_cache(maxsize=2)
 def sample_config(exclude_none: bool = False) -> str:
     """Returns the contents of a sample config file as a TOML string.
 
+    The sample config only depends on the default values of the
+    config models, so the result is cached.
+
     Parameters
     ----------
     exclude_none : bool
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import functools
 from typing import Any
 from typing import Optional
 from typing import Sequence
+from typing import Tuple
 
 from ...state import get_state
 from ...style import EMOJI_NO
@@ -52,6 +54,13 @@ def plural_str(value: str, sequence: Sequence[Any]) -> str:
     """Format a string as a pluralized string if a given sequence is
     not of length 1.
     """
+    singular_value, plural_value = _singular_plural(value)
+    return singular_value if len(sequence) == 1 else plural_value
+
+
+@functools.lru_cache(maxsize=256)
+def _singular_plural(value: str) -> Tuple[str, str]:
+    """Get the singular and plural forms of a string."""
     if value.endswith("y"):
         plural_value = value[:-1] + "ies"
     elif value.endswith("ies"):
@@ -62,4 +71,4 @@ def plural_str(value: str, sequence: Sequence[Any]) -> str:
         value = value[:-1]
     else:
         plural_value = value + "s"
-    return value if len(sequence) == 1 else f"{plural_value}"
+    return value, plural_value
@@ -30,7 +30,7 @@ def get_table(
     title: str | None = None,
     data: Sequence[Any] | None = None,  # not a rich Table kwarg
     pluralize: bool = True,  # not a rich Table kwarg
-    columns: list[str] | None = None,  # not a rich Table kwarg
+    columns: Sequence[str] | None = None,  # not a rich Table kwarg
     **kwargs: Unpack[RichTableKwargs],
 ) -> Table:
     """Get a table with our defaults."""
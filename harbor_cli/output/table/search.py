@@ -13,15 +13,18 @@ from rich.table import Table
 from ...logs import logger
 from ..formatting.builtin import bool_str
 from ..formatting.builtin import int_str
+from ..formatting.constants import NONE_STR
 from ._utils import get_table
 from .project import project_table
 
 
 def search_panel(search: Sequence[Search], **kwargs: Any) -> Panel:
     """Display one or more repositories in a table."""
-    if len(search) != 1:
+    if not search:
+        return Panel("No results", title="Search Results", expand=True)
+    if len(search) > 1:
         logger.warning("Can only display one search result at a time.")
-    s = search[0]  # guaranteed to be at least one result
+    s = search[0]
 
     tables: List[Table] = []
     # Re-use the project table function
@@ -31,24 +34,23 @@ def search_panel(search: Sequence[Search], **kwargs: Any) -> Panel:
     if s.repository:
         tables.append(searchrepo_table(s.repository))
 
-    return Panel(Group(*tables), title=f"Search Results", expand=True)
+    renderable = tables[0] if len(tables) == 1 else Group(*tables)
+    return Panel(renderable, title="Search Results", expand=True)
+
+
+_SEARCHREPO_COLUMNS = ("Project", "Name", "Artifacts", "Public")
 
 
 def searchrepo_table(repos: Sequence[SearchRepository], **kwargs: Any) -> Table:
-    table = get_table(
-        "Repository",
-        repos,
-        columns=[
-            "Project",
-            "Name",
-            "Artifacts",
-            "Public",
-        ],
-    )
+    table = get_table("Repository", repos, columns=_SEARCHREPO_COLUMNS)
+    add_row = table.add_row
     for repo in repos:
-        table.add_row(
-            str(repo.project_name),
-            str(repo.repository_name),
+        # Names are already strings, so only None needs to be converted
+        project_name = repo.project_name
+        repository_name = repo.repository_name
+        add_row(
+            project_name if project_name is not None else NONE_STR,
+            repository_name if repository_name is not None else NONE_STR,
             int_str(repo.artifact_count),
             bool_str(repo.project_public),
         )
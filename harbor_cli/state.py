@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import asyncio
+import threading
+import time
 from functools import cached_property
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Coroutine
+from typing import List
 from typing import Optional
+from typing import Protocol
+from typing import Set
+from typing import Tuple
 from typing import TypeVar
 
 from harborapi import HarborAsyncClient
@@ -21,11 +27,22 @@ from rich.console import Console
 if TYPE_CHECKING:
     from logging import Logger
 
+    from harborapi.models.models import CVEAllowlist
+
     from .config import HarborCLIConfig
 
 
 T = TypeVar("T")
 
+CONFIG_SAVE_DELAY = 0.2
+"""Seconds to wait after the last config change before saving the config in the REPL."""
+
+
+class PendingOperation(Protocol):
+    """A batched operation that is deferred until it is flushed."""
+
+    def flush(self) -> None: ...
+
 
 class CommonOptions(BaseModel):
     """Options that can be used with any command.
@@ -57,6 +74,8 @@ class State:
         return cls._instance
 
     options: CommonOptions = CommonOptions()
+    # Re-used by every call to run(), so the HTTP client's open connections
+    # survive between commands in the REPL. Never close it or use asyncio.run().
     loop: asyncio.AbstractEventLoop
     repl: bool = False
 
@@ -65,6 +84,22 @@ class State:
     _client: Optional[HarborAsyncClient] = None
     _console: Optional[Console] = None
 
+    # Batched operations waiting to be flushed
+    pending_allowlist: Optional[PendingOperation] = None
+
+    # Debounced config saving (REPL only)
+    _config_save_lock = threading.Lock()
+    _config_save_timer: Optional[threading.Timer] = None
+    _config_save_args: Optional[
+        Tuple[HarborCLIConfig, Optional[Path], Optional[Set[str]]]
+    ] = None
+
+    # Cached API responses (monotonic fetch time, response)
+    allowlist_cache: Optional[Tuple[float, CVEAllowlist]] = None
+
+    # Config values the client was last authenticated with
+    _client_auth_key: Optional[Tuple[Any, ...]] = None
+
     # Flags to determine if the config or client have been loaded
     _config_loaded: bool = False
     _client_loaded: bool = False
@@ -125,6 +160,7 @@ class State:
     def client(self, client: HarborAsyncClient) -> None:
         self._client = client
         self._client_loaded = True
+        self._client_auth_key = None
 
     @property
     def config(self) -> HarborCLIConfig:
@@ -177,6 +213,25 @@ class State:
         self.client.authenticate(
             **self.config.harbor.credentials, verify=self.config.harbor.verify_ssl
         )
+        self._client_auth_key = self._get_client_auth_key()
+
+    def _get_client_auth_key(self) -> Tuple[Any, ...]:
+        """Get the config values that determine how the client is authenticated.
+
+        The client only has to be re-authenticated when these change,
+        which saves us from looking up the secret in the keyring or
+        reading the credentials file before every request.
+        """
+        harbor = self.config.harbor
+        return (
+            harbor.url,
+            harbor.username,
+            harbor.secret,
+            harbor.basicauth,
+            harbor.credentials_file,
+            harbor.keyring,
+            harbor.verify_ssl,
+        )
 
     def _init_client(self) -> None:
         """Configures Harbor client if it hasn't been configured yet.
@@ -271,6 +326,111 @@ class State:
                 )
                 self.config.harbor.keyring = False
 
+    def mark_config_dirty(
+        self, path: Optional[Path] = None, key: Optional[str] = None
+    ) -> None:
+        """Save the current config to disk.
+
+        In REPL mode, saving is debounced. The config is saved
+        `CONFIG_SAVE_DELAY` seconds after the last call, so a burst of
+        changes only writes the config file once. Outside of the REPL,
+        the config is saved immediately.
+
+        Parameters
+        ----------
+        path : Optional[Path]
+            Path to save the config to. Uses the config's own path if `None`.
+        key : Optional[str]
+            Dot notation key of the changed value. Only the changed keys
+            are updated in the config file. Saves the whole config if `None`.
+        """
+        keys = {key} if key is not None else None
+        if not self.repl:
+            self.config.save(path=path, keys=keys)
+            return
+        with self._config_save_lock:
+            if self._config_save_timer is not None:
+                self._config_save_timer.cancel()
+            if self._config_save_args is not None:
+                config, pending_path, pending_keys = self._config_save_args
+                # Unset first so a failed save is not retried indefinitely
+                self._config_save_args = None
+                if config is not self.config or pending_path != path:
+                    # Can't merge with the pending save
+                    config.save(path=pending_path, keys=pending_keys)
+                elif keys is not None and pending_keys is not None:
+                    keys |= pending_keys
+                else:
+                    keys = None
+            self._config_save_args = (self.config, path, keys)
+            timer = threading.Timer(CONFIG_SAVE_DELAY, self._save_config_debounced)
+            timer.daemon = True
+            self._config_save_timer = timer
+            timer.start()
+
+    def flush_config(self) -> None:
+        """Save the config to disk now if a debounced save is pending."""
+        with self._config_save_lock:
+            if self._config_save_timer is not None:
+                self._config_save_timer.cancel()
+                self._config_save_timer = None
+            args, self._config_save_args = self._config_save_args, None
+            if args is not None:
+                config, path, keys = args
+                config.save(path=path, keys=keys)
+
+    def _save_config_debounced(self) -> None:
+        """Timer callback for debounced config saving."""
+        try:
+            self.flush_config()
+        except Exception as e:
+            from .output.console import error
+
+            error(f"Unable to save config: {e}", exc_info=True)
+
+    def flush_pending(self) -> None:
+        """Flush all pending batched operations.
+
+        Called before running commands that depend on the result of
+        the batched operations, and when exiting the REPL.
+        """
+        if self.pending_allowlist is not None:
+            pending = self.pending_allowlist
+            # Unset first so a failed flush is not retried indefinitely
+            self.pending_allowlist = None
+            pending.flush()
+
+    def get_cve_allowlist_cached(self, ttl: float = 5.0) -> CVEAllowlist:
+        """Fetch the system CVE allowlist, re-using the allowlist from the
+        previous fetch if it was fetched less than `ttl` seconds ago.
+
+        The cache must be invalidated by setting `allowlist_cache` to `None`
+        after modifying the allowlist.
+
+        Parameters
+        ----------
+        ttl : float, optional
+            Max age of the cached allowlist in seconds, by default 5.0.
+            A TTL of 0 always fetches a fresh allowlist.
+
+        Returns
+        -------
+        CVEAllowlist
+            A copy of the allowlist that is safe to modify.
+        """
+        if self.allowlist_cache is not None:
+            fetched, allowlist = self.allowlist_cache
+            if time.monotonic() - fetched < ttl:
+                return allowlist.model_copy(deep=True)
+        allowlist = self.run(
+            self.client.get_cve_allowlist(), "Fetching CVE allowlist..."
+        )
+        # Raw mode returns unvalidated data (despite the annotated return type),
+        # which we don't cache
+        if isinstance(allowlist, BaseModel):  # pyright: ignore[reportUnnecessaryIsInstance]
+            self.allowlist_cache = (time.monotonic(), allowlist.model_copy(deep=True))
+        return allowlist
+
     def run(
         self,
         coro: Coroutine[None, None, T],
@@ -303,7 +463,7 @@ class State:
             # Make sure client is loaded and configured
             if not self.is_client_loaded:
                 self._init_client()
-            else:
+            elif self._client_auth_key != self._get_client_auth_key():
                 self.authenticate_harbor()  # ensure we use newest credentials
 
             if not status:
@@ -333,6 +493,52 @@ class State:
                 self.logger.debug("Failed to close coroutine.", exc_info=True)
                 pass
 
+    def run_many(
+        self,
+        *coros: Coroutine[None, None, T],
+        status: Optional[str] = None,
+        no_handle: type[Exception] | tuple[type[Exception], ...] | None = None,
+    ) -> List[T]:
+        """Run multiple independent coroutines concurrently in the event loop.
+
+        If one of the coroutines fails, the remaining ones are cancelled.
+
+        Parameters
+        ----------
+        *coros : Coroutine[None, None, T]
+            The coroutines to run, which all return type T.
+        status : str, optional
+            The status message to display while the coroutines are running.
+        no_handle : type[Exception] | tuple[type[Exception], ...] | None
+            One or more Exception types to not pass to the default
+            exception handler. See [harbor_cli.state.State.run][].
+
+        Returns
+        -------
+        List[T]
+            The return values of the coroutines, in the order they were given.
+        """
+
+        async def gather() -> List[T]:
+            tasks = [asyncio.ensure_future(coro) for coro in coros]
+            try:
+                return list(await asyncio.gather(*tasks))
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+        try:
+            return self.run(gather(), status=status, no_handle=no_handle)
+        finally:
+            # Close coros in case we never got to run them
+            for coro in coros:
+                try:
+                    coro.close()
+                except Exception:
+                    self.logger.debug("Failed to close coroutine.", exc_info=True)
+
 
 def get_state() -> State:
     """Returns the global state object.
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Callable
 from typing import Dict
 from typing import Literal
+from typing import Union
 
 from harborapi.models.scanner import Severity
 from strenum import StrEnum
@@ -102,15 +103,13 @@ class SeverityColor(StrEnum):
     @classmethod
     def from_severity(cls, severity: str | Severity) -> str:
         """Return the color for the given severity level."""
+        color = _SEVERITY_COLORS.get(severity)
+        if color is not None:
+            return color
+        # Unknown severity or unexpected casing, e.g. "critical"
         if isinstance(severity, Severity):
             severity = severity.value
-        try:
-            color = getattr(cls, severity.upper())
-            if isinstance(color, SeverityColor):
-                return color
-            raise ValueError(f"Invalid severity: {severity}")
-        except (AttributeError, ValueError):
-            return SeverityColor.UNKNOWN
+        return _SEVERITY_COLORS.get(severity.upper(), SeverityColor.UNKNOWN)
 
     @classmethod
     def as_markup(cls, severity: str | Severity) -> str:
@@ -118,7 +117,41 @@ class SeverityColor(StrEnum):
 
         I.e. "[dark_red]CRITICAL[/]" for Severity.CRITICAL, etc.
         """
-        color = cls.from_severity(severity)
+        markup = _SEVERITY_MARKUP.get(severity)
+        if markup is not None:
+            return markup
+        # Unknown severity or unexpected casing, e.g. "critical"
         if isinstance(severity, Severity):
             severity = severity.value
-        return f"[{color}]{severity.upper()}[/]"
+        name = severity.upper()
+        markup = _SEVERITY_MARKUP.get(name)
+        if markup is None:
+            markup = f"[{SeverityColor.UNKNOWN}]{name}[/]"
+        return markup
+
+
+_SEVERITY_COLORS: Dict[Union[str, Severity], SeverityColor] = {
+    **SeverityColor.__members__
+}
+"""Severity colors keyed by upper case severity name,
+as well as by `Severity` members and their values (e.g. "Critical")."""
+_SEVERITY_COLORS.update(
+    {
+        key: _SEVERITY_COLORS[severity.value.upper()]
+        for severity in Severity
+        for key in (severity, severity.value)
+    }
+)
+
+_SEVERITY_MARKUP: Dict[Union[str, Severity], str] = {
+    name: f"[{color}]{name}[/]" for name, color in SeverityColor.__members__.items()
+}
+"""Rich markup-formatted severity names keyed by upper case severity name,
+as well as by `Severity` members and their values (e.g. "Critical")."""
+_SEVERITY_MARKUP.update(
+    {
+        key: SeverityColor.as_markup(severity.value)
+        for severity in Severity
+        for key in (severity, severity.value)
+    }
+)
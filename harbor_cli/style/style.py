@@ -1,6 +1,7 @@
 # Rich markup styles for the CLI
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any
 
 from strenum import StrEnum
@@ -51,11 +52,13 @@ def render_warning(msg: str) -> str:
     return f"[{STYLE_WARNING}]WARNING: {msg}[/]"
 
 
+@lru_cache(maxsize=256)
 def render_config_option(option: str) -> str:
     """Render a configuration file option/key/entry."""
     return f"[{STYLE_CONFIG_OPTION}]{option}[/]"
 
 
+@lru_cache(maxsize=256)
 def render_cli_option(option: str) -> str:
     """Render a CLI option."""
     return f"[{STYLE_CLI_OPTION}]{option}[/]"
@@ -66,6 +69,7 @@ def render_cli_value(value: Any) -> str:
     return f"[{STYLE_CLI_VALUE}]{value!r}[/]"
 
 
+@lru_cache(maxsize=256)
 def render_cli_command(value: str) -> str:
     """Render a CLI command."""
     return f"[{STYLE_CLI_COMMAND}]{value}[/]"
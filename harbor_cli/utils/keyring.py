@@ -80,10 +80,12 @@ def delete_password(username: str) -> None:
     info("Deleted password from keyring.", user=username)
 
 
+@functools.lru_cache(maxsize=1)
 def get_backend() -> KeyringBackend:
     return keyring.get_keyring()
 
 
 def clear_supported_cache() -> None:
-    """Clears the keyring availability cache."""
+    """Clears the keyring availability and backend caches."""
     keyring_supported.cache_clear()
+    get_backend.cache_clear()
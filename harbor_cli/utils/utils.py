@@ -69,7 +69,7 @@ def replace_none(
         if isinstance(value, MutableMapping):
             d[key] = replace_none(value)  # pyright: ignore[reportUnknownArgumentType]
         elif isinstance(value, str):
-            d[key] = value
+            continue  # iterable, but nothing to replace
         elif isinstance(value, Iterable):
             d[key] = _iter_iterable(value)  # pyright: ignore[reportUnknownArgumentType]
         elif value is None:
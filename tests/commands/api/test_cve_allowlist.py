@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+from harborapi.models.models import CVEAllowlist
+from harborapi.models.models import CVEAllowlistItem
+
+from harbor_cli.commands.api.cve_allowlist import _PendingAllowlistBatch
+from harbor_cli.commands.api.cve_allowlist import _update_allowlist
+from harbor_cli.state import State
+
+
+@pytest.fixture
+def allowlist_api(state: State, monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """Mocks the CVE allowlist API endpoints. Returns a list of the
+    names of the endpoints that are called, in order."""
+    calls: List[str] = []
+    allowlist = CVEAllowlist(
+        items=[
+            CVEAllowlistItem(cve_id="CVE-2021-0001"),
+            CVEAllowlistItem(cve_id="CVE-2021-0002"),
+        ]
+    )
+
+    async def get_cve_allowlist() -> CVEAllowlist:
+        calls.append("get")
+        return allowlist.model_copy(deep=True)
+
+    async def update_cve_allowlist(new: CVEAllowlist) -> None:
+        nonlocal allowlist
+        calls.append("update")
+        allowlist = new
+
+    monkeypatch.setattr(state.client, "get_cve_allowlist", get_cve_allowlist)
+    monkeypatch.setattr(state.client, "update_cve_allowlist", update_cve_allowlist)
+    monkeypatch.setattr(state, "allowlist_cache", None)
+    monkeypatch.setattr(state, "pending_allowlist", None)
+    return calls
+
+
+def test_pending_allowlist_batch_flush(state: State, allowlist_api: List[str]) -> None:
+    batch = _PendingAllowlistBatch()
+    batch.queue(["CVE-2021-1000", "CVE-2021-1001"], remove=False)
+    batch.queue(["CVE-2021-0001"], remove=True)
+    # Most recent change wins
+    batch.queue(["CVE-2021-1001"], remove=True)
+    batch.queue(["CVE-2021-0001"], remove=False)
+    assert batch.to_add == {"CVE-2021-1000", "CVE-2021-0001"}
+    assert batch.to_remove == {"CVE-2021-1001"}
+
+    batch.flush()
+    # All queued changes are applied with a single fetch + update
+    assert allowlist_api == ["get", "update"]
+
+    allowlist = state.get_cve_allowlist_cached()
+    assert allowlist.items is not None
+    assert [item.cve_id for item in allowlist.items] == [
+        "CVE-2021-0001",
+        "CVE-2021-0002",
+        "CVE-2021-1000",
+    ]
+
+
+def test_pending_allowlist_batch_flush_empty(allowlist_api: List[str]) -> None:
+    _PendingAllowlistBatch().flush()
+    assert allowlist_api == []
+
+
+@pytest.mark.parametrize(
+    "command,calls",
+    [
+        (["update", "--cve", "CVE-2021-1000"], ["get", "update"]),
+        (["get"], ["get", "get"]),
+    ],
+)
+def test_flush_pending_remove_empty_allowlist(
+    invoke,
+    state: State,
+    allowlist_api: List[str],
+    command: List[str],
+    calls: List[str],
+) -> None:
+    """A queued removal from an empty allowlist does not abort the
+    command that flushes it."""
+    state.run(state.client.update_cve_allowlist(CVEAllowlist()))
+    allowlist_api.clear()
+    batch = _PendingAllowlistBatch()
+    batch.queue(["CVE-2021-0001"], remove=True)
+    state.pending_allowlist = batch
+
+    result = invoke(["cve-allowlist", *command])
+    assert result.exit_code == 0, result.stderr
+    assert state.pending_allowlist is None
+    assert allowlist_api == calls
+
+    allowlist = state.get_cve_allowlist_cached(ttl=0)
+    if command[0] == "update":
+        assert allowlist.items is not None
+        assert [item.cve_id for item in allowlist.items] == ["CVE-2021-1000"]
+    else:
+        assert allowlist.items is None
+
+
+def test_update_batch_repl(
+    invoke, state: State, allowlist_api: List[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(state, "repl", True)
+    # Don't leak the config snapshot taken by REPL commands into other tests
+    monkeypatch.setattr("harbor_cli.main._PRE_OVERRIDE_CONFIG", None)
+    for cve_id in ["CVE-2021-1000", "CVE-2021-1001", "CVE-2021-1002"]:
+        result = invoke(["cve-allowlist", "update", "--batch", "--cve", cve_id])
+        assert result.exit_code == 0, result.stderr
+    assert allowlist_api == []  # nothing applied yet
+
+    state.flush_pending()
+    assert allowlist_api == ["get", "update"]
+    assert state.pending_allowlist is None
+
+
+def test_update_allowlist_dedup(state: State, allowlist_api: List[str]) -> None:
+    current = _update_allowlist(
+        add=["CVE-2021-1000", "", "CVE-2021-1000", "CVE-2021-0001"], remove=[]
+    )
+    assert allowlist_api == ["get", "update"]
+    assert current is not None
+    assert current.items is not None
+    # Exactly one item per new CVE ID, and none for empty or existing IDs
+    assert [item.cve_id for item in current.items] == [
+        "CVE-2021-0001",
+        "CVE-2021-0002",
+        "CVE-2021-1000",
+    ]
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 import os
+import sys
 from pathlib import Path
+from typing import Optional
 
+import pytest
+from pydantic import BaseModel
+from pydantic import Field
 from pytest import LogCaptureFixture
 
+from harbor_cli.commands.cli.self import _config_dotted_keys
+from harbor_cli.commands.cli.self import _config_dotted_tables
+from harbor_cli.commands.cli.self import _model_subfields
 from harbor_cli.config import EnvVar
 from harbor_cli.config import HarborCLIConfig
+from harbor_cli.config import load_toml_file
 from harbor_cli.format import OutputFormat
 from harbor_cli.state import State
 
@@ -79,6 +88,36 @@ def test_cli_config_set(invoke, state: State, config_file: Path) -> None:
     )  # Saved to disk
 
 
+def test_cli_config_set_path(
+    invoke, state: State, config_file: Path, tmp_path: Path
+) -> None:
+    state.config.config_file = config_file
+    state.config.output.format = OutputFormat.TABLE
+
+    # The config's own file only has the changed key updated
+    with open(config_file, "a") as f:
+        f.write('\n[foo]\nbar = "baz"\n')
+    result = invoke(
+        ["cli-config", "set", "output.format", "json", "--path", str(config_file)]
+    )
+    assert result.exit_code == 0, result.stderr
+    contents = load_toml_file(config_file)
+    assert contents["foo"] == {"bar": "baz"}
+    assert contents["output"]["format"] == "json"
+
+    # A different file gets the whole config
+    other_file = tmp_path / "other.toml"
+    other_file.write_text('[foo]\nbar = "baz"\n')
+    result = invoke(
+        ["cli-config", "set", "output.format", "table", "--path", str(other_file)]
+    )
+    assert result.exit_code == 0, result.stderr
+    assert "foo" not in load_toml_file(other_file)
+    other_config = HarborCLIConfig.from_file(other_file)
+    assert other_config.harbor.url == state.config.harbor.url
+    assert other_config.output.format == OutputFormat.TABLE
+
+
 def test_cli_config_set_session(invoke, state: State, config_file: Path) -> None:
     state.config.config_file = config_file
 
@@ -102,3 +141,115 @@ def test_env_var_set(invoke) -> None:
     assert res.exit_code == 0
     assert "URL" in res.stdout
     assert "https://example.com" in res.stdout
+
+
+def test_cli_config_keys(invoke, state: State, config_file: Path) -> None:
+    state.config.config_file = config_file
+
+    result = invoke(["cli-config", "keys"])
+    assert result.exit_code == 0, result.stderr
+    assert "harbor.url" in result.stdout
+    assert "harbor.retry.max_tries" in result.stdout
+    assert "output.table.style.rows" in result.stdout
+    assert "output.JSON.indent" in result.stdout
+    # Excluded fields are not keys
+    assert "config_file" not in result.stdout
+
+
+def test_cli_config_invalid_key(invoke, state: State, config_file: Path) -> None:
+    state.config.config_file = config_file
+
+    for args in [
+        ["cli-config", "get", "harbor.foo"],
+        ["cli-config", "set", "harbor.foo", "bar"],
+        ["cli-config", "set", "harbor.retry", "bar"],  # table
+        ["cli-config", "set", "harbor", "bar"],  # top-level table
+    ]:
+        result = invoke(args)
+        assert result.exit_code == 1, args
+        assert "Invalid config key" in result.stderr
+
+
+def test_cli_config_path(invoke, state: State, tmp_path: Path) -> None:
+    conf = tmp_path / "path_config.toml"
+    state.config.config_file = conf
+
+    result = invoke(["cli-config", "path"])
+    assert result.exit_code == 0, result.stderr
+    assert "File does not exist" in result.stderr
+
+    conf.write_text("  \n")
+    result = invoke(["cli-config", "path"])
+    assert result.exit_code == 0, result.stderr
+    assert "File exists, but is empty" in result.stderr
+
+    conf.write_text("[harbor]\n")
+    result = invoke(["cli-config", "path"])
+    assert result.exit_code == 0, result.stderr
+    assert "empty" not in result.stderr
+
+    # Parent of the config file is a regular file (ENOTDIR)
+    state.config.config_file = conf / "config.toml"
+    result = invoke(["cli-config", "path"])
+    assert result.exit_code == 0, result.stderr
+    assert "File does not exist" in result.stderr
+
+    # Symlink loop (ELOOP)
+    loop = tmp_path / "loop.toml"
+    loop.symlink_to(loop)
+    state.config.config_file = loop
+    result = invoke(["cli-config", "path"])
+    assert result.exit_code == 0, result.stderr
+    assert "File does not exist" in result.stderr
+
+
+def test_env_all(invoke) -> None:
+    res = invoke(["cli-config", "env", "--all"], env={})
+    assert res.exit_code == 0
+    lines = res.stdout.splitlines()
+    positions = [
+        next(i for i, line in enumerate(lines) if f" {env_var} " in line)
+        for env_var in sorted(EnvVar)
+    ]
+    assert positions == sorted(positions)  # all listed in sorted order
+
+
+def test_env_var_markup_not_rendered(invoke) -> None:
+    res = invoke(["cli-config", "env"], env={EnvVar.PAGER: "less [bold]"})
+    assert res.exit_code == 0
+    assert "less [bold]" in res.stdout
+
+
+def test_model_subfields() -> None:
+    class Nested(BaseModel):
+        foo: int = 1
+
+    class Model(BaseModel):
+        a: int = 1
+        b: Nested = Nested()
+        c: Optional[Nested] = None
+        d: Optional[int] = None
+        e: int = Field(default=1, exclude=True)
+
+    assert _model_subfields(Model) == (
+        ("a", None),
+        ("b", Nested),
+        ("c", Nested),
+        ("d", None),
+    )
+    assert _config_dotted_keys(Model) == ("a", "b.foo", "c.foo", "d")
+    assert _config_dotted_tables(Model) == ("b", "c")
+    assert "harbor.retry" in _config_dotted_tables(HarborCLIConfig)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="PEP 604 unions need 3.10+")
+def test_model_subfields_pep604_optional() -> None:
+    class Nested(BaseModel):
+        foo: int = 1
+
+    class Model(BaseModel):
+        a: Nested | None = None
+        b: int | None = None
+
+    assert _model_subfields(Model) == (("a", Nested), ("b", None))
+    assert _config_dotted_keys(Model) == ("a.foo", "b")
@@ -5,15 +5,19 @@ from typing import TypeVar
 
 import pytest
 import rich
+from harborapi.models.models import Search
+from harborapi.models.models import SearchRepository
 from hypothesis import assume
 from hypothesis import given
 from hypothesis import strategies as st
 from pydantic import BaseModel
+from rich.table import Table
 
 from ..._strategies import COMPACT_TABLE_MODELS
 from harbor_cli.output.table import BuiltinTypeException
 from harbor_cli.output.table import EmptySequenceError
 from harbor_cli.output.table import get_renderable
+from harbor_cli.output.table.search import search_panel
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -53,3 +57,14 @@ def test_get_renderable_builtin(obj: Any, as_sequence: bool) -> None:
 def test_get_renderable_list_of_list() -> None:
     with pytest.raises(NotImplementedError):
         get_renderable([[]])  # type: ignore
+
+
+def test_search_panel() -> None:
+    panel = search_panel([])
+    assert panel.renderable == "No results"
+
+    # A single table is rendered directly without a group
+    search = Search(repository=[SearchRepository(repository_name="foo")])
+    panel = search_panel([search])
+    assert isinstance(panel.renderable, Table)
+    rich.print(panel)
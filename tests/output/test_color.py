@@ -31,6 +31,7 @@ def test_from_severity():
     assert SeverityColor.from_severity(Severity.unknown) == SeverityColor.UNKNOWN
 
     assert SeverityColor.from_severity("INVALID") == SeverityColor.UNKNOWN
+    assert SeverityColor.from_severity("__class__") == SeverityColor.UNKNOWN
 
 
 def test_as_markup():
@@ -51,6 +52,12 @@ def test_as_markup():
     assert SeverityColor.as_markup(Severity.none) == "[white]NONE[/]"
     assert SeverityColor.as_markup(Severity.unknown) == "[white]UNKNOWN[/]"
 
+    # Case insensitive, unknown severities use the UNKNOWN color
+    assert SeverityColor.as_markup("critical") == "[dark_red]CRITICAL[/]"
+    assert SeverityColor.as_markup("INVALID") == "[white]INVALID[/]"
+    # Values of the Severity enum (as passed in by the vulnerability table)
+    assert SeverityColor.as_markup(Severity.critical.value) == "[dark_red]CRITICAL[/]"
+
 
 def test_assert_color_mapping_parity() -> None:
     """Ensure the `Color` type annotation and `COLOR_FUNCTIONS` dict are in sync."""
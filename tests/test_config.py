@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import copy
+import os
 from pathlib import Path
 
 import keyring
@@ -15,15 +16,21 @@ from pytest import LogCaptureFixture
 
 from .conftest import requires_keyring
 from .conftest import requires_no_keyring
+from harbor_cli.config import _TOML_CACHE
+from harbor_cli.config import create_config
 from harbor_cli.config import HarborCLIConfig
 from harbor_cli.config import HarborSettings
 from harbor_cli.config import load_config
 from harbor_cli.config import load_toml_file
 from harbor_cli.config import LoggingSettings
+from harbor_cli.config import OutputSettings
 from harbor_cli.config import sample_config
 from harbor_cli.config import save_config
+from harbor_cli.config import save_config_keys
 from harbor_cli.config import TableSettings
 from harbor_cli.config import TableStyleSettings
+from harbor_cli.config import write_toml_file
+from harbor_cli.exceptions import OverwriteError
 from harbor_cli.output.console import warning
 from harbor_cli.state import State
 from harbor_cli.utils.keyring import set_password
@@ -35,6 +42,74 @@ def test_save_config(tmp_path: Path, config: HarborCLIConfig) -> None:
     assert conf_path.exists()
 
 
+def test_save_config_keys(tmp_path: Path, config: HarborCLIConfig) -> None:
+    conf_path = tmp_path / "config.toml"
+    conf_path.write_text(
+        """\
+[harbor]
+url = "https://harbor.example.com/api/v2.0"
+unknown_key = "preserved"
+"""
+    )
+    config.harbor.url = "https://other.example.com/api/v2.0"
+    config.output.table.style.rows = ("black", "white")
+    config.output.table.style.title = None
+    config.harbor.username = "not_saved"
+    save_config_keys(
+        config,
+        conf_path,
+        ["harbor.url", "output.table.style.rows", "output.table.style.title"],
+    )
+    assert load_toml_file(conf_path) == {
+        "harbor": {
+            "url": "https://other.example.com/api/v2.0",
+            "unknown_key": "preserved",
+        },
+        "output": {"table": {"style": {"rows": ["black", "white"]}}},
+    }
+
+
+def test_save_config_keys_aliases(tmp_path: Path, config: HarborCLIConfig) -> None:
+    """Patches the spelling of a key that is loaded from the file."""
+    conf_path = tmp_path / "config.toml"
+    conf_path.write_text(
+        """\
+[harbor]
+validate = true
+
+[output.json]
+indent = 2
+"""
+    )
+    config.harbor.validate_data = False
+    config.output.JSON.indent = 8
+    save_config_keys(config, conf_path, ["harbor.validate_data", "output.JSON.indent"])
+    assert load_toml_file(conf_path) == {
+        "harbor": {"validate": False},
+        "output": {"json": {"indent": 8}},
+    }
+    loaded = load_config(conf_path)
+    assert loaded.harbor.validate_data is False
+    assert loaded.output.JSON.indent == 8
+
+
+def test_save_config_keys_no_file(tmp_path: Path, config: HarborCLIConfig) -> None:
+    """Saves the whole config if the file does not exist."""
+    conf_path = tmp_path / "config.toml"
+    save_config_keys(config, conf_path, ["harbor.url"])
+    assert load_config(conf_path).toml() == config.toml()
+
+
+def test_save_config_keys_invalid_encoding(
+    tmp_path: Path, config: HarborCLIConfig
+) -> None:
+    """Saves the whole config if the file is not valid UTF-8."""
+    conf_path = tmp_path / "config.toml"
+    conf_path.write_bytes('[harbor]\nusername = "bjørn"\n'.encode("latin-1"))
+    save_config_keys(config, conf_path, ["harbor.url"])
+    assert load_config(conf_path).toml() == config.toml()
+
+
 def test_load_config(tmp_path: Path, config: HarborCLIConfig) -> None:
     conf_path = tmp_path / "config.toml"
     save_config(config, conf_path)
@@ -59,6 +134,27 @@ format = "table"
     }
 
 
+def test_load_toml_file_cache(tmp_path: Path) -> None:
+    toml_file = tmp_path / "config.toml"
+    write_toml_file(toml_file, '[harbor]\nurl = "https://harbor.example.com"\n')
+
+    loaded = load_toml_file(toml_file)
+    assert toml_file in _TOML_CACHE
+    # Modifying the returned dict does not modify the cached contents
+    loaded["harbor"]["url"] = "https://other.example.com"
+    assert load_toml_file(toml_file) == {
+        "harbor": {"url": "https://harbor.example.com"}
+    }
+
+    # Writing invalidates the cache, even with identical mtime and size
+    st = toml_file.stat()
+    write_toml_file(toml_file, '[harbor]\nurl = "https://harbor.elpmaxe.com"\n')
+    os.utime(toml_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert load_toml_file(toml_file) == {
+        "harbor": {"url": "https://harbor.elpmaxe.com"}
+    }
+
+
 @given(st.builds(HarborCLIConfig))
 def test_harbor_cli_config_fuzz(config: HarborCLIConfig) -> None:
     """Fuzzing with hypothesis."""
@@ -94,6 +190,20 @@ def test_harbor_cli_config_from_file_create(tmp_path: Path) -> None:
     assert f.exists()
 
 
+def test_create_config_overwrite(tmp_path: Path) -> None:
+    f = tmp_path / "subdir" / "config.toml"
+    assert create_config(f) == f
+    assert f.read_text() == sample_config()
+
+    f.write_text("[harbor]\n")
+    with pytest.raises(OverwriteError):
+        create_config(f)
+    assert f.read_text() == "[harbor]\n"  # not modified
+
+    create_config(f, overwrite=True)
+    assert f.read_text() == sample_config()
+
+
 @given(st.builds(HarborSettings))
 def test_harbor_settings(settings: HarborSettings) -> None:
     assert settings is not None
@@ -315,6 +425,13 @@ def test_sample_config() -> None:
     assert config_dict  # not empty, not None
 
 
+@pytest.mark.parametrize("exclude_none", [True, False])
+def test_sample_config_is_default_config(exclude_none: bool) -> None:
+    s = sample_config(exclude_none=exclude_none)
+    assert s == HarborCLIConfig().toml(exclude_none=exclude_none)
+    assert s is sample_config(exclude_none=exclude_none)  # cached
+
+
 @pytest.mark.parametrize("expose_secrets", [True, False])
 def test_harbor_cli_config_toml_expose_secrets(
     config: HarborCLIConfig, expose_secrets: bool, tmp_path: Path
@@ -439,3 +556,15 @@ def test_general_settings_warnings(
         assert "test warning" in captured.err
     else:
         assert "test warning" not in captured.err
+
+
+def test_unknown_config_keys_warning(caplog: LogCaptureFixture) -> None:
+    # Aliases are known keys
+    HarborSettings(**{"validate": False})
+    OutputSettings(**{"json": {"indent": 4}})
+    LoggingSettings(**{"timeformat": "%Y"})
+    assert not caplog.records
+
+    HarborSettings(**{"url": "https://example.com", "foo": "bar"})
+    assert len(caplog.records) == 1
+    assert "HarborSettings: Got unknown config key 'foo'." in caplog.records[0].message
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import io
 import os
 from base64 import b64encode
+from pathlib import Path
 
 import pytest
 from harborapi import HarborAsyncClient
+from harborapi.models.models import CVEAllowlist
+from harborapi.models.models import CVEAllowlistItem
 
 from harbor_cli.config import HarborCLIConfig
+from harbor_cli.exceptions import ConfigError
 from harbor_cli.output.console import console
 from harbor_cli.state import get_state
 from harbor_cli.state import State
@@ -45,6 +50,24 @@ def test_state_run_verify_ssl(
     assert state.client.client._transport._pool._ssl_context.verify_mode == expect_mode
 
 
+def test_state_run_reuses_http_client(state: State) -> None:
+    """Ensure that consecutive runs share the event loop and HTTP client,
+    so that open connections are re-used between commands."""
+
+    async def func() -> None:
+        return
+
+    state.run(func())
+    loop = state.loop
+    http_client = state.client.client
+
+    state.run(func())
+    assert state.loop is loop
+    assert not loop.is_closed()
+    assert state.client.client is http_client
+    assert not http_client.is_closed
+
+
 @pytest.mark.timeout(1)  # timeout to avoid hanging on prompt
 @pytest.mark.parametrize(
     "url",
@@ -120,6 +143,37 @@ def test_state_console() -> None:
     assert new_state.console is console
 
 
+def test_state_run_reauthenticates_on_credential_change(
+    state: State, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The client is only re-authenticated when the credentials change."""
+
+    async def func() -> None:
+        return
+
+    calls = 0
+    authenticate = state.client.authenticate
+
+    def mock_authenticate(*args, **kwargs) -> None:
+        nonlocal calls
+        calls += 1
+        authenticate(*args, **kwargs)
+
+    monkeypatch.setattr(state.client, "authenticate", mock_authenticate)
+    state._client_loaded = True
+    state._client_auth_key = None
+
+    state.run(func())
+    state.run(func())
+    assert calls == 1
+
+    state.config.harbor.username = "otheruser"
+    state.run(func())
+    assert calls == 2
+    state.run(func())
+    assert calls == 2
+
+
 def test_state_client() -> None:
     """Ensure that the client property re-uses the same client object"""
     # de-init singleton for testing
@@ -183,3 +237,167 @@ def test_get_state() -> None:
     state2 = get_state()
     state3 = State()
     assert state1 is state2 is state3
+
+
+def test_state_flush_pending(state: State) -> None:
+    """Ensure that pending operations are flushed exactly once."""
+
+    class Pending:
+        flushed = 0
+
+        def flush(self) -> None:
+            self.flushed += 1
+
+    pending = Pending()
+    state.pending_allowlist = pending
+    state.flush_pending()
+    assert pending.flushed == 1
+    assert state.pending_allowlist is None
+
+    # Nothing pending, nothing to flush
+    state.flush_pending()
+    assert pending.flushed == 1
+
+
+def test_state_get_cve_allowlist_cached(
+    state: State, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = 0
+
+    async def get_cve_allowlist() -> CVEAllowlist:
+        nonlocal calls
+        calls += 1
+        return CVEAllowlist(items=[CVEAllowlistItem(cve_id="CVE-2021-1234")])
+
+    monkeypatch.setattr(state.client, "get_cve_allowlist", get_cve_allowlist)
+    state.allowlist_cache = None
+
+    allowlist = state.get_cve_allowlist_cached()
+    assert calls == 1
+    # Modifying the returned allowlist does not modify the cached one
+    allowlist.items = []
+    cached = state.get_cve_allowlist_cached()
+    assert calls == 1
+    assert cached.items and cached.items[0].cve_id == "CVE-2021-1234"
+
+    # TTL of 0 always fetches a new allowlist
+    state.get_cve_allowlist_cached(ttl=0)
+    assert calls == 2
+
+    # Invalidated cache
+    state.allowlist_cache = None
+    state.get_cve_allowlist_cached()
+    assert calls == 3
+
+
+def test_state_mark_config_dirty_repl(
+    state: State, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Ensure that config saves are debounced in the REPL."""
+    saved: list[tuple[Path | None, set[str] | None]] = []
+
+    def save(
+        self: HarborCLIConfig, path: Path | None = None, keys: set[str] | None = None
+    ) -> None:
+        saved.append((path, keys))
+
+    monkeypatch.setattr(HarborCLIConfig, "save", save)
+    monkeypatch.setattr(state, "repl", True)
+    monkeypatch.setattr("harbor_cli.state.CONFIG_SAVE_DELAY", 60)
+
+    state.mark_config_dirty(key="harbor.url")
+    state.mark_config_dirty(key="output.format")
+    assert saved == []
+    state.flush_pending()  # only flushes batched API operations
+    assert saved == []
+    state.flush_config()
+    assert saved == [(None, {"harbor.url", "output.format"})]  # saved once
+
+    # Nothing pending
+    state.flush_config()
+    assert len(saved) == 1
+
+    # Full save supersedes saving individual keys
+    state.mark_config_dirty(key="harbor.url")
+    state.mark_config_dirty()
+    state.flush_config()
+    assert saved[1:] == [(None, None)]
+
+    # Pending save for another path is saved before scheduling a new save
+    state.mark_config_dirty(key="harbor.url")
+    state.mark_config_dirty(path=Path("foo.toml"), key="harbor.url")
+    assert saved[2:] == [(None, {"harbor.url"})]
+    state.flush_config()
+    assert saved[2:] == [(None, {"harbor.url"}), (Path("foo.toml"), {"harbor.url"})]
+
+
+def test_state_mark_config_dirty_repl_save_error(
+    state: State, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Ensure that a failed save of a pending config save is not retried."""
+
+    def save(
+        self: HarborCLIConfig, path: Path | None = None, keys: set[str] | None = None
+    ) -> None:
+        raise ConfigError("Unable to save config")
+
+    monkeypatch.setattr(HarborCLIConfig, "save", save)
+    monkeypatch.setattr(state, "repl", True)
+    monkeypatch.setattr("harbor_cli.state.CONFIG_SAVE_DELAY", 60)
+
+    state.mark_config_dirty(key="harbor.url")
+    with pytest.raises(ConfigError):
+        state.mark_config_dirty(path=Path("foo.toml"), key="harbor.url")
+    assert state._config_save_args is None
+    state.flush_config()  # nothing pending
+
+
+def test_state_mark_config_dirty_no_repl(
+    state: State, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Ensure that the config is saved immediately outside of the REPL."""
+    saved: list[tuple[Path | None, set[str] | None]] = []
+
+    def save(
+        self: HarborCLIConfig, path: Path | None = None, keys: set[str] | None = None
+    ) -> None:
+        saved.append((path, keys))
+
+    monkeypatch.setattr(HarborCLIConfig, "save", save)
+    monkeypatch.setattr(state, "repl", False)
+
+    state.mark_config_dirty(key="harbor.url")
+    assert saved == [(None, {"harbor.url"})]
+
+
+def test_state_run_many(state: State) -> None:
+    started: list[int] = []
+
+    async def coro(n: int) -> int:
+        started.append(n)
+        await asyncio.sleep(0)
+        # All coroutines have started before any of them finish
+        assert started == [1, 2, 3]
+        return n
+
+    assert state.run_many(coro(1), coro(2), coro(3)) == [1, 2, 3]
+
+
+def test_state_run_many_nohandle(state: State) -> None:
+    cancelled = False
+
+    async def fail() -> int:
+        raise ValueError("test")
+
+    async def slow() -> int:
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        return 1
+
+    with pytest.raises(ValueError):
+        state.run_many(slow(), fail(), no_handle=ValueError)
+    assert cancelled  # remaining coroutines are cancelled
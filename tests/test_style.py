@@ -143,6 +143,8 @@ def test_strenum_as_str() -> None:
         "magenta",
         "red",
         "yellow",
+        "gold3",
+        "bold",
     ],
 )
 def test_color_func(func_name: str) -> None: